@@ -9,49 +9,863 @@ import os
 from dotenv import load_dotenv
 import parsedatetime as pdt 
 import time 
+import heapq
+import re
+import sqlite3
+import threading
+import queue
+import hashlib
+import difflib
+import shutil
+import tempfile
+import wave
+from collections import OrderedDict, deque
+import argparse
+import statistics
+from dataclasses import dataclass, field
+from typing import Optional
+from data_provider import CachedFetcher
+from command_router import CommandRouter
+from command_table import APP_ALIASES, COMMANDS
+from tracing import Tracer, percentile
+from process_manager import LaunchResult, ProcessManager
 
 load_dotenv()
-engine = pyttsx3.init()
-
-rate = engine.getProperty('rate')
-engine.setProperty('rate', 140)     
-voices = engine.getProperty('voices')
-engine.setProperty('voice', voices[1].id) # 0 means male and female is 1
-
 
 
 WEATHER_API_KEY = os.getenv("WEATHER_API_KEY")
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
+REMINDER_DB = os.getenv("REMINDER_DB", "reminders.sqlite3")
+RECALIBRATE_SECONDS = int(os.getenv("RECALIBRATE_SECONDS", 300))
+DEFAULT_CITY = os.getenv("DEFAULT_CITY", "Mysuru")
+NEWS_COUNTRY = os.getenv("NEWS_COUNTRY", "us")
+WEATHER_TTL = int(os.getenv("WEATHER_TTL", 600))
+NEWS_TTL = int(os.getenv("NEWS_TTL", 900))
+# Background refresh periods. NewsAPI's developer plan allows 100 requests a day,
+# so news is prefetched hourly (24 a day) to leave room for live lookups.
+WEATHER_PREFETCH_SECONDS = int(os.getenv("WEATHER_PREFETCH_SECONDS", WEATHER_TTL * 0.8))
+NEWS_PREFETCH_SECONDS = int(os.getenv("NEWS_PREFETCH_SECONDS", 3600))
+PHRASE_CACHE_DIR = os.getenv("PHRASE_CACHE_DIR", "tts_cache")
+PHRASE_CACHE_MB = int(os.getenv("PHRASE_CACHE_MB", 50))
+PLUGIN_DIR = os.getenv("PLUGIN_DIR", "plugins")
+TRACE_LOG = os.getenv("TRACE_LOG", "turn_traces.jsonl")
+TURN_BUDGET_MS = int(os.getenv("TURN_BUDGET_MS", 2500))
+
+WEATHER_URL = "http://api.openweathermap.org/data/2.5/weather"
+NEWS_URL = "https://newsapi.org/v2/top-headlines"
+
+fetcher = CachedFetcher()
+tracer = Tracer(TRACE_LOG, budget_ms=TURN_BUDGET_MS)
+
+
+def init_engine():
+    engine = pyttsx3.init()
+
+    rate = engine.getProperty('rate')
+    engine.setProperty('rate', 140)     
+    voices = engine.getProperty('voices')
+    engine.setProperty('voice', voices[1].id) # 0 means male and female is 1
+    return engine
+
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+# Utterances worth pre-rendering at startup; anything else is cached once it repeats.
+WARM_PHRASES = [
+    "Hello! I am your voice assistant. How can I help you today?",
+    "Sorry, I didn't catch that. Could you please repeat?",
+    "Sorry, my speech service is down. Please check your internet connection.",
+    "An unexpected error occurred. Please try again.",
+    "Sorry, I don't know how to do that yet.",
+    "Certainly. What should I remind you about?",
+    "Sorry, I couldn't fetch the weather data. Please check your API key and internet connection.",
+    "Goodbye! Have a great day.",
+]
+
+
+def find_audio_player():
+    if sys.platform == "win32":
+        return ["winsound"]
+    if sys.platform == "darwin":
+        return ["afplay"]
+    for command in (["aplay", "-q"], ["paplay"], ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet"]):
+        if shutil.which(command[0]):
+            return command
+    return None
+
+
+AUDIO_PLAYER = find_audio_player()
+
+
+class AudioPlayback:
+    # Plays a cached file without blocking so the TTS worker can still honour barge-in.
+    def __init__(self, path, command=None):
+        command = command or AUDIO_PLAYER
+        self._proc = None
+        if command == ["winsound"]:
+            import winsound
+            with wave.open(path, 'rb') as w:
+                self._ends_at = time.time() + w.getnframes() / float(w.getframerate())
+            winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_ASYNC)
+        else:
+            self._proc = subprocess.Popen(command + [path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def is_playing(self):
+        if self._proc is not None:
+            return self._proc.poll() is None
+        return time.time() < self._ends_at
+
+    def stop(self):
+        if self._proc is not None:
+            self._proc.terminate()
+            self._proc.wait()
+        else:
+            import winsound
+            winsound.PlaySound(None, 0)
+
+
+class PhraseCache:
+    # Rendered audio for frequent utterances, keyed by text, voice and rate.
+    # Files are kept in LRU order (by mtime, so it survives restarts) within max_bytes.
+    def __init__(self, directory, max_bytes, min_repeats=2, max_tracked=512):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.min_repeats = min_repeats
+        self.max_tracked = max_tracked
+        self._counts = OrderedDict()  # text -> times spoken, least recently spoken first
+        self._entries = OrderedDict()  # path -> size, least recently used first
+        self._bytes = 0
+        self._lock = threading.Lock()
+        if os.path.isdir(directory):
+            files = []
+            for name in os.listdir(directory):
+                path = os.path.join(directory, name)
+                if name.startswith("tmp-"):
+                    os.remove(path)
+                elif name.endswith(".wav"):
+                    files.append((os.path.getmtime(path), path))
+            for _, path in sorted(files):
+                self._track(path)
+
+    def path_for(self, text, voice, rate):
+        digest = hashlib.sha1(f"{voice}|{rate}|{text}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest + ".wav")
+
+    def lookup(self, text, voice, rate):
+        path = self.path_for(text, voice, rate)
+        with self._lock:
+            if path not in self._entries:
+                return None
+            self._entries.move_to_end(path)
+        try:
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self._forget(path)
+            return None
+        return path
+
+    def should_render(self, text):
+        """Count a live utterance; True once it has repeated often enough to be worth caching."""
+        if len(text) > 200:
+            return False
+        with self._lock:
+            count = self._counts.pop(text, 0) + 1
+            self._counts[text] = count
+            if len(self._counts) > self.max_tracked:
+                self._counts.popitem(last=False)
+            return count == self.min_repeats
+
+    def add(self, path):
+        with self._lock:
+            self._track(path)
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                oldest = next(iter(self._entries))
+                self._forget(oldest)
+                try:
+                    os.remove(oldest)
+                except OSError:
+                    pass
+
+    def clear(self):
+        with self._lock:
+            for path in list(self._entries):
+                self._forget(path)
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._counts.clear()
+
+    def _track(self, path):
+        size = os.path.getsize(path)
+        self._bytes += size - self._entries.pop(path, 0)
+        self._entries[path] = size
+
+    def _forget(self, path):
+        self._bytes -= self._entries.pop(path, 0)
+
+
+class SpeechQueue:
+    # A single worker thread owns the pyttsx3 engine (it is not thread safe) and
+    # speaks queued utterances in priority order, so callers never block on speech.
+    def __init__(self, engine_factory, phrase_cache=None):
+        self.engine_factory = engine_factory
+        self.phrase_cache = phrase_cache
+        self._warm_phrases = []
+        self._heap = []
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._thread = None
+        self._interrupt = False
+        self._speaking = None
+        self._finished = threading.Event()
+        self._utterances = 0
+        self._expected = None
+        self._spoken = deque(maxlen=8)  # [text, started, ended] of recent utterances
+        self.failed = None
+        self.muted = False
+
+    def start(self):
+        with self._cond:
+            if self._thread is not None or self.muted:
+                return
+            self._thread = threading.Thread(target=self._run, name="tts", daemon=True)
+            self._thread.start()
+
+    def say(self, text, priority=PRIORITY_NORMAL, coalesce_key=None, on_start=None):
+        """Queue text and return an Event that is set once it is spoken or dropped.
+
+        on_start, if given, is called from the worker when the utterance starts playing.
+        """
+        done = threading.Event()
+        if self.muted:
+            done.set()
+            return done
+        with self._cond:
+            # Coalesce: a newer message replaces a queued one with the same key or text.
+            kept = []
+            for item in self._heap:
+                _, _, kind, payload, key, event, _ = item
+                if kind == "say" and (payload == text or (coalesce_key and key == coalesce_key)):
+                    event.set()
+                else:
+                    kept.append(item)
+            if len(kept) != len(self._heap):
+                self._heap = kept
+                heapq.heapify(self._heap)
+            self._push(priority, "say", text, coalesce_key, done, on_start)
+        return done
+
+    def set_rate(self, rate_value):
+        done = threading.Event()
+        with self._cond:
+            self._push(PRIORITY_NORMAL, "rate", rate_value, None, done)
+        return done
+
+    def warm(self, phrases):
+        """Render phrases into the phrase cache in the background, whenever the worker is idle."""
+        if self.phrase_cache is None or self.muted:
+            return
+        with self._cond:
+            self._warm_phrases = list(phrases)
+            for text in self._warm_phrases:
+                self._push(PRIORITY_LOW, "render", text, None, threading.Event())
+
+    def interrupt(self):
+        """Barge-in: stop the current utterance and drop queued normal-priority speech."""
+        with self._cond:
+            kept = []
+            for item in self._heap:
+                if item[2] == "say" and item[0] >= PRIORITY_NORMAL:
+                    item[5].set()
+                else:
+                    kept.append(item)
+            self._heap = kept
+            heapq.heapify(self._heap)
+            if self._speaking is not None and self._speaking >= PRIORITY_NORMAL:
+                self._interrupt = True
+
+    def is_echo(self, heard, start, end):
+        """True if heard (recognised text) is the assistant's own speech, picked up between start and end."""
+        words = re.findall(r"[a-z0-9']+", heard.lower())
+        if not words:
+            return False
+        with self._cond:
+            # Allow for audio still draining from the output device after the engine finishes.
+            spoken = [text for text, began, ended in self._spoken
+                      if began <= end and (ended is None or ended + 0.5 >= start)]
+        for text in spoken:
+            said = set(re.findall(r"[a-z0-9']+", text.lower()))
+            if sum(word in said for word in words) >= 0.8 * len(words):
+                return True
+        return False
+
+    def _push(self, priority, kind, payload, key, event, on_start=None):
+        if self.failed is not None:
+            # No engine to speak with; release anyone waiting with block=True.
+            event.set()
+            return
+        self._seq += 1
+        heapq.heappush(self._heap, (priority, self._seq, kind, payload, key, event, on_start))
+        self._cond.notify_all()
+
+    def _next_name(self):
+        # Drivers report a stopped utterance on a later iterate(), so each one gets
+        # a name and only the callback for the one in progress counts.
+        self._utterances += 1
+        self._expected = f"utterance-{self._utterances}"
+        self._finished.clear()
+        return self._expected
+
+    def _on_finished(self, name, completed):
+        if name == self._expected:
+            self._finished.set()
+
+    def _run(self):
+        try:
+            engine = self.engine_factory()
+            engine.connect('finished-utterance', self._on_finished)
+            engine.startLoop(False)
+            voice = engine.getProperty('voice')
+            rate = engine.getProperty('rate')
+        except Exception as e:
+            print(f"Speech engine failed to start: {e}")
+            with self._cond:
+                self.failed = e
+                for item in self._heap:
+                    item[5].set()
+                self._heap = []
+                self._cond.notify_all()
+            return
+
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                priority, _, kind, payload, _, done, on_start = heapq.heappop(self._heap)
+                if kind == "say":
+                    self._speaking = priority
+                    self._interrupt = False
+                    self._spoken.append([payload, time.perf_counter(), None])
+
+            try:
+                if kind == "rate":
+                    engine.setProperty('rate', payload)
+                    rate = payload
+                    if self.phrase_cache is not None:
+                        # Audio rendered at the old rate is useless now; rebuild the warm set.
+                        self.phrase_cache.clear()
+                        self.warm(self._warm_phrases)
+                elif kind == "render":
+                    self._render(engine, payload, voice, rate)
+                else:
+                    cached = self.phrase_cache.lookup(payload, voice, rate) if self.phrase_cache else None
+                    if on_start is not None:
+                        on_start()
+                    if cached:
+                        self._play(cached)
+                    else:
+                        self._say_live(engine, payload)
+                        if self.phrase_cache is not None and self.phrase_cache.should_render(payload):
+                            with self._cond:
+                                self._push(PRIORITY_LOW, "render", payload, None, threading.Event())
+            except Exception as e:
+                print(f"Speech error ({kind}): {e}")
+            finally:
+                done.set()
+                with self._cond:
+                    if self._speaking is not None:
+                        self._spoken[-1][2] = time.perf_counter()
+                    self._speaking = None
+                    self._cond.notify_all()
+
+    def _say_live(self, engine, text):
+        engine.say(text, self._next_name())
+        while not self._finished.is_set():
+            if self._interrupt:
+                engine.stop()
+                break
+            engine.iterate()
+            self._finished.wait(0.02)
+
+    def _play(self, path):
+        playback = AudioPlayback(path)
+        while playback.is_playing():
+            if self._interrupt:
+                playback.stop()
+                break
+            time.sleep(0.02)
+
+    def _say_waiting(self):
+        with self._cond:
+            return any(item[2] == "say" for item in self._heap)
+
+    def _defer_render(self, text):
+        with self._cond:
+            self._push(PRIORITY_LOW, "render", text, None, threading.Event())
+
+    def _render(self, engine, text, voice, rate):
+        # Rendering is only worth doing while nothing is waiting to be said: a
+        # reply queued before or during a render puts the render back in line.
+        cache = self.phrase_cache
+        if cache.lookup(text, voice, rate):
+            return
+        if self._say_waiting():
+            self._defer_render(text)
+            return
+        path = cache.path_for(text, voice, rate)
+        tmp = os.path.join(cache.directory, "tmp-" + os.path.basename(path))
+        os.makedirs(cache.directory, exist_ok=True)
+        engine.save_to_file(text, tmp, self._next_name())
+        deadline = time.time() + 10
+        deferred = False
+        while not self._finished.is_set():
+            deferred = self._say_waiting()
+            if deferred or time.time() >= deadline:
+                break
+            engine.iterate()
+            self._finished.wait(0.02)
 
+        if self._finished.is_set() and os.path.exists(tmp) and os.path.getsize(tmp) > 0:
+            os.replace(tmp, path)
+            cache.add(path)
+            return
+        if not self._finished.is_set():
+            # Deferred or timed out: the partial file is unusable and the engine must be free.
+            engine.stop()
+            if not deferred:
+                print(f"Gave up rendering '{text}' after 10 seconds.")
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass  # missing, or still held open by the driver; cleaned up on the next start
+        if deferred:
+            self._defer_render(text)
 
-def speak(text):
+
+phrase_cache = PhraseCache(PHRASE_CACHE_DIR, PHRASE_CACHE_MB * 1024 * 1024) if AUDIO_PLAYER else None
+speech_queue = SpeechQueue(init_engine, phrase_cache)
+
+
+def speak(text, priority=PRIORITY_NORMAL, coalesce_key=None, block=False, turn=None):
     
     print(f"Assistant: {text}")
-    engine.say(text)
-    engine.runAndWait()
+    speech_queue.start()
+    # Speech from other threads (reminders) isn't part of a turn unless one is passed in.
+    turn = turn or tracer.turn_for_caller()
+    enqueued_at = time.perf_counter()
+    done = speech_queue.say(text, priority, coalesce_key,
+                            on_start=lambda: tracer.first_audio(turn, enqueued_at))
+    if block:
+        done.wait()
 
-def listen_for_command():
-   
-    recognizer = sr.Recognizer()
-    with sr.Microphone() as source:
-        print("Listening...")
-        recognizer.pause_threshold = 1
-        recognizer.adjust_for_ambient_noise(source, duration=1)
-        audio = recognizer.listen(source)
+REMINDER_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS reminders (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    text TEXT NOT NULL,
+    due_at REAL NOT NULL,
+    interval_seconds INTEGER,
+    done INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_reminders_pending ON reminders(done, due_at);
+"""
+
+
+class ReminderScheduler:
+    # Pending reminders live in SQLite and in an in-memory heap ordered by due time,
+    # so the timer thread only ever looks at the head and sleeps until it is due.
+    def __init__(self, path, on_due):
+        self.path = path
+        self.on_due = on_due
+        self._heap = []
+        self._cancelled = set()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+    def start(self):
+        if self._thread is not None:
+            return
+        with sqlite3.connect(self.path) as conn:
+            conn.executescript(REMINDER_SCHEMA_SQL)
+            rows = conn.execute(
+                "SELECT id, due_at, text, interval_seconds FROM reminders WHERE done=0"
+            ).fetchall()
+        with self._cond:
+            self._heap = [(due_at, rid, text, interval) for rid, due_at, text, interval in rows]
+            heapq.heapify(self._heap)
+        self._thread = threading.Thread(target=self._run, name="reminders", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def add(self, text, due_at, interval_seconds=None):
+        due_ts = due_at.timestamp()
+        with sqlite3.connect(self.path) as conn:
+            cur = conn.execute(
+                "INSERT INTO reminders(text, due_at, interval_seconds) VALUES(?,?,?)",
+                (text, due_ts, interval_seconds),
+            )
+            rid = cur.lastrowid
+        with self._cond:
+            heapq.heappush(self._heap, (due_ts, rid, text, interval_seconds))
+            # Only wake the timer if the new reminder is now the earliest one.
+            if self._heap[0][1] == rid:
+                self._cond.notify()
+        return rid
+
+    def cancel(self, rid):
+        with sqlite3.connect(self.path) as conn:
+            conn.execute("UPDATE reminders SET done=1 WHERE id=?", (rid,))
+        with self._cond:
+            self._cancelled.add(rid)
+            self._cond.notify()
+
+    def pending(self):
+        with self._cond:
+            return sorted(item for item in self._heap if item[1] not in self._cancelled)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    while self._heap and self._heap[0][1] in self._cancelled:
+                        self._cancelled.discard(heapq.heappop(self._heap)[1])
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    delay = self._heap[0][0] - time.time()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(timeout=delay)
+                if self._stopped:
+                    return
+                due_ts, rid, text, interval = heapq.heappop(self._heap)
+                if interval:
+                    # Skip occurrences missed while the assistant was not running.
+                    next_ts = due_ts + interval
+                    now = time.time()
+                    if next_ts <= now:
+                        next_ts += ((now - next_ts) // interval + 1) * interval
+                    heapq.heappush(self._heap, (next_ts, rid, text, interval))
+
+            with sqlite3.connect(self.path) as conn:
+                if interval:
+                    conn.execute("UPDATE reminders SET due_at=? WHERE id=?", (next_ts, rid))
+                else:
+                    conn.execute("UPDATE reminders SET done=1 WHERE id=?", (rid,))
+            try:
+                self.on_due(text)
+            except Exception as e:
+                print(f"Reminder error: {e}")
+
+
+def announce_reminder(text):
+    speak(f"Reminder: {text}", priority=PRIORITY_HIGH)
+
+
+reminder_scheduler = ReminderScheduler(REMINDER_DB, announce_reminder)
+
+
+class InputExhausted(Exception):
+    """Raised by listen_for_command() when a finite input source has no more utterances."""
+
+
+class GoogleBackend:
+    def __init__(self, language='en-in'):
+        self.language = language
+
+    def recognize(self, recognizer, audio, expected=None):
+        return recognizer.recognize_google(audio, language=self.language)
+
+
+class SphinxBackend:
+    # Offline CMU Sphinx recognition; needs the pocketsphinx package.
+    def recognize(self, recognizer, audio, expected=None):
+        return recognizer.recognize_sphinx(audio)
 
+
+class TranscriptBackend:
+    # Offline stand-in for benchmarks and regression runs: "recognises" a recording
+    # as the reference transcript stored alongside it.
+    def recognize(self, recognizer, audio, expected=None):
+        if not expected:
+            raise sr.UnknownValueError()
+        return expected
+
+
+RECOGNIZER_BACKENDS = {
+    "google": GoogleBackend,
+    "sphinx": SphinxBackend,
+    "transcript": TranscriptBackend,
+}
+
+
+def recognize_result(backend, recognizer, audio, expected=None):
+    """Run a backend and wrap the outcome as a (kind, value) result for listen_for_command()."""
     try:
         print("Recognizing...")
-        command = recognizer.recognize_google(audio, language='en-in')
-        print(f"User said: {command}\n")
-        return command.lower()
+        return ("text", backend.recognize(recognizer, audio, expected))
     except sr.UnknownValueError:
+        return ("unknown", None)
+    except sr.RequestError as e:
+        return ("request_error", e)
+    except Exception as e:
+        return ("error", e)
+
+
+class BackgroundListener:
+    # The microphone is opened and calibrated once. A capture thread keeps pulling
+    # phrases into a queue while a recognition thread transcribes the previous one,
+    # so recognising phrase N overlaps with capturing phrase N+1.
+    # Capture keeps running while the assistant talks so the user can interrupt it.
+    # echo_guard(text, start, end) says whether recognised text is the assistant's
+    # own speech picked up by the microphone; such phrases are dropped.
+    # After max_failures microphone errors in a row the listener gives up.
+    def __init__(self, backend=None, recalibrate_seconds=RECALIBRATE_SECONDS, echo_guard=None, max_failures=6):
+        self.backend = backend or GoogleBackend()
+        self.echo_guard = echo_guard
+        self.max_failures = max_failures
+        self._failures = 0
+        self.recalibrate_seconds = recalibrate_seconds
+        self.recognizer = sr.Recognizer()
+        self.recognizer.pause_threshold = 1
+        self.recognizer.dynamic_energy_threshold = True
+        self._audio = queue.Queue()
+        self.results = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        threading.Thread(target=self._capture, name="capture", daemon=True).start()
+        threading.Thread(target=self._recognize, name="recognize", daemon=True).start()
+
+    def next_result(self):
+        self.start()
+        return self.results.get()
+
+    def flush(self):
+        """Drop phrases heard before now, e.g. before asking a follow-up question."""
+        for pending in (self._audio, self.results):
+            while True:
+                try:
+                    pending.get_nowait()
+                except queue.Empty:
+                    break
+
+    def _capture(self):
+        while True:
+            try:
+                self._capture_from_microphone()
+            except Exception as e:
+                # Surface microphone / calibration failures through listen_for_command:
+                # once when they start, then retry quietly with backoff before giving up.
+                self._failures += 1
+                if self._failures >= self.max_failures:
+                    self.results.put(("fatal", e, {}, None))
+                    return
+                if self._failures == 1:
+                    self.results.put(("error", e, {}, None))
+                time.sleep(min(60, 2 ** self._failures))
+
+    def _capture_from_microphone(self):
+        # Timings travel with each phrase so they are traced against the turn that uses it.
+        with sr.Microphone() as source:
+            print("Calibrating for ambient noise...")
+            t0 = time.perf_counter()
+            self.recognizer.adjust_for_ambient_noise(source, duration=1)
+            spans = {"calibrate": (time.perf_counter() - t0) * 1000}
+            calibrated_at = time.time()
+            self._failures = 0
+            print("Listening...")
+            while True:
+                t0 = time.perf_counter()
+                try:
+                    audio = self.recognizer.listen(source, timeout=1)
+                except sr.WaitTimeoutError:
+                    # Silence: a good moment to re-measure the noise floor.
+                    if time.time() - calibrated_at >= self.recalibrate_seconds:
+                        t0 = time.perf_counter()
+                        self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
+                        spans["calibrate"] = spans.get("calibrate", 0.0) + (time.perf_counter() - t0) * 1000
+                        calibrated_at = time.time()
+                    continue
+                heard_at = time.perf_counter()
+                spans["capture"] = (heard_at - t0) * 1000
+                self._audio.put((audio, spans, t0, heard_at))
+                spans = {}
+
+    def _recognize(self):
+        while True:
+            audio, spans, listened_at, heard_at = self._audio.get()
+            t0 = time.perf_counter()
+            kind, value = recognize_result(self.backend, self.recognizer, audio)
+            spans["recognition"] = (time.perf_counter() - t0) * 1000
+            if kind == "text" and self.echo_guard is not None and self.echo_guard(value, listened_at, heard_at):
+                continue
+            self.results.put((kind, value, spans, heard_at))
+
+
+@dataclass
+class UtteranceStats:
+    label: str
+    expected: Optional[str] = None
+    recognized: Optional[str] = None
+    capture_ms: float = 0.0
+    recognition_ms: float = 0.0
+    dispatch_ms: float = 0.0
+
+
+@dataclass
+class FileSource:
+    """Feeds recorded WAV files through the same path as the microphone."""
+    utterances: list  # [(path, expected transcript or None)]
+    backend: object = field(default_factory=TranscriptBackend)
+    stats: list = field(default_factory=list)
+
+    def __post_init__(self):
+        self.recognizer = sr.Recognizer()
+        self._pending = iter(self.utterances)
+        self._returned_at = None
+        self.started_at = None
+        self.finished_at = None
+
+    def next_result(self):
+        if self.started_at is None:
+            self.started_at = time.perf_counter()
+        self.finish()
+
+        try:
+            path, expected = next(self._pending)
+        except StopIteration:
+            raise InputExhausted()
+
+        item = UtteranceStats(label=os.path.basename(path), expected=expected)
+        t0 = time.perf_counter()
+        with sr.AudioFile(path) as source:
+            audio = self.recognizer.record(source)
+        t1 = time.perf_counter()
+        kind, value = recognize_result(self.backend, self.recognizer, audio, expected)
+        item.capture_ms = (t1 - t0) * 1000
+        item.recognition_ms = (time.perf_counter() - t1) * 1000
+        if kind == "text":
+            item.recognized = value
+        self.stats.append(item)
+        self._returned_at = time.perf_counter()
+        return kind, value, {"capture": item.capture_ms, "recognition": item.recognition_ms}, t1
+
+    def flush(self):
+        pass
+
+    def finish(self):
+        now = time.perf_counter()
+        self.finished_at = now
+        if self._returned_at is not None:
+            # Everything since the previous result was handed out was dispatch work.
+            self.stats[-1].dispatch_ms = (now - self._returned_at) * 1000
+            self._returned_at = None
+
+
+def read_transcript(wav):
+    txt = os.path.splitext(wav)[0] + ".txt"
+    if not os.path.exists(txt):
+        return None
+    with open(txt, encoding="utf-8") as f:
+        return f.read().strip()
+
+
+def load_batch(path):
+    """Collect (wav path, transcript) pairs from a WAV file, a directory or a JSONL manifest.
+
+    For WAV files, the transcript is read from a .txt file next to each .wav.
+    Manifest lines look like {"audio": "clips/time.wav", "text": "what time is it"},
+    with audio paths relative to the manifest.
+    """
+    utterances = []
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if not name.lower().endswith(".wav"):
+                continue
+            wav = os.path.join(path, name)
+            utterances.append((wav, read_transcript(wav)))
+    elif path.lower().endswith(".wav"):
+        utterances.append((path, read_transcript(path)))
+    else:
+        base = os.path.dirname(os.path.abspath(path))
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                utterances.append((os.path.join(base, entry["audio"]), entry.get("text")))
+    return utterances
+
+
+def print_batch_report(source):
+    print("\n--- Batch Report ---")
+    for item in source.stats:
+        print(f"{item.label}: '{item.recognized}' "
+              f"read={item.capture_ms:.1f}ms recognition={item.recognition_ms:.1f}ms "
+              f"dispatch={item.dispatch_ms:.1f}ms")
+
+    count = len(source.stats)
+    if count == 0:
+        print("No utterances processed.")
+        return
+    elapsed = source.finished_at - source.started_at
+    recognition = [item.recognition_ms for item in source.stats]
+    dispatch = [item.dispatch_ms for item in source.stats]
+    print(f"Utterances: {count} in {elapsed:.2f}s ({count / elapsed if elapsed else 0:.2f}/s)")
+    print(f"Recognition: mean={statistics.mean(recognition):.1f}ms p95={percentile(recognition, 95):.1f}ms")
+    print(f"Dispatch: mean={statistics.mean(dispatch):.1f}ms p95={percentile(dispatch, 95):.1f}ms")
+    scored = [item for item in source.stats if item.expected]
+    if scored:
+        correct = sum(1 for item in scored if (item.recognized or "").lower() == item.expected.lower())
+        print(f"Exact matches: {correct}/{len(scored)}")
+    print("--------------------\n")
+
+
+input_source = BackgroundListener(echo_guard=speech_queue.is_echo)
+
+
+def listen_for_command(flush=False):
+   
+    if flush:
+        input_source.flush()
+    t0 = time.perf_counter()
+    kind, value, spans, heard_at = input_source.next_result()
+    tracer.begin_turn(value if kind == "text" else None, spans, heard_at,
+                      waited_ms=(time.perf_counter() - t0) * 1000)
+
+    if kind == "text":
+        print(f"User said: {value}\n")
+        speech_queue.interrupt() # a new command drops whatever is still queued to be said
+        return value.lower()
+    elif kind == "unknown":
         speak("Sorry, I didn't catch that. Could you please repeat?")
         return None
-    except sr.RequestError:
+    elif kind == "request_error":
         speak("Sorry, my speech service is down. Please check your internet connection.")
         return None
-    except Exception as e:
-        print(e)
+    elif kind == "fatal":
+        speak("I can't use the microphone, so I'm shutting down.", block=True)
+        raise value
+    else:
+        print(value)
         speak("An unexpected error occurred. Please try again.")
         return None
 
@@ -61,16 +875,30 @@ def tell_time():
     current_time = datetime.datetime.now().strftime("%I:%M %p")
     speak(f"The current time is {current_time}")
 
-def get_weather(city="Mysuru"):
-    
-    base_url = "http://api.openweathermap.org/data/2.5/weather?"
-    complete_url = f"{base_url}appid={WEATHER_API_KEY}&q={city}&units=metric"
+def weather_request(city):
+    return ("weather", city.lower()), WEATHER_URL, {"appid": WEATHER_API_KEY, "q": city, "units": "metric"}
+
+
+def news_request(country=NEWS_COUNTRY):
+    return ("news", country), NEWS_URL, {"country": country, "apiKey": NEWS_API_KEY}
+
+
+def start_prefetch():
+    # Keep the default city and the headlines warm so the common questions answer from cache.
+    if WEATHER_API_KEY:
+        fetcher.start_prefetch([weather_request(DEFAULT_CITY)], ttl=WEATHER_TTL,
+                               interval=WEATHER_PREFETCH_SECONDS)
+    if NEWS_API_KEY:
+        fetcher.start_prefetch([news_request()], ttl=NEWS_TTL, interval=NEWS_PREFETCH_SECONDS)
+
+
+def get_weather(city=DEFAULT_CITY):
     
     try:
-        response = requests.get(complete_url)
-        data = response.json()
+        with tracer.span("weather_fetch"):
+            status, data = fetcher.get(*weather_request(city), ttl=WEATHER_TTL)
         
-        if data["cod"] != "404":
+        if str(data["cod"]) != "404":
             main = data["main"]
             weather_desc = data["weather"][0]["description"]
             temp = main["temp"]
@@ -79,7 +907,7 @@ def get_weather(city="Mysuru"):
             weather_report = (f"The weather in {city} is currently {weather_desc}, "
                               f"with a temperature of {temp} degrees Celsius "
                               f"and humidity at {humidity} percent.")
-            speak(weather_report)
+            speak(weather_report, coalesce_key="weather")
         else:
             speak(f"Sorry, I couldn't find the city {city}. Please try another one.")
     except Exception as e:
@@ -91,17 +919,14 @@ def get_news():
     print("\nERROR: Could not load NEWS_API_KEY from .env file. Please check the file.")
    else:
 
-    base_url = f"https://newsapi.org/v2/top-headlines?country=us&apiKey={NEWS_API_KEY}"
-    
     try:
-        print(f"Attempting to connect to: {base_url}")
-        response = requests.get(base_url)
-        print(f"Status Code: {response.status_code}")
+        print(f"Fetching headlines from: {NEWS_URL}")
+        with tracer.span("news_fetch"):
+            status, data = fetcher.get(*news_request(), ttl=NEWS_TTL)
+        print(f"Status Code: {status}")
 
 
-        if response.status_code == 200:
-            data = response.json()
-            
+        if status == 200:
 
             if data.get('status') == 'ok':
                 articles = data.get('articles', [])
@@ -121,159 +946,332 @@ def get_news():
         
         else:
 
-            print(f"\nHTTP Error: Failed to retrieve data. Status code: {response.status_code}")
-            print(f"Response: {response.text}")
+            print(f"\nHTTP Error: Failed to retrieve data. Status code: {status}")
+            print(f"Response: {data}")
 
 
     except requests.exceptions.RequestException as e:
         print(f"\nAN ERROR OCCURRED: {e}")
         print("This is likely a network problem. Check your internet connection or firewall.")
         
+app_manager = ProcessManager()
+
+
 def open_application(app_name):
   
-    speak(f"Opening {app_name}...")
-    platform = sys.platform
-    
+    if not app_manager.candidates:
+        speak(f"Unsupported operating system: {sys.platform}")
+        return
+    if not app_manager.known(app_name):
+        speak(f"Sorry, I don't know how to open {app_name} on this computer.")
+        return
 
-    if platform == "win32": # Windows
-        if app_name == "notepad":
-            subprocess.Popen(["notepad.exe"])
-        elif app_name == "document":
-            subprocess.Popen(["start", "winword"], shell=True)
-        elif app_name == "excel":
-            subprocess.Popen(["start", "excel"], shell=True)
-        else:
-            speak(f"Sorry, I don't know how to open {app_name} on Windows.")
-            
-    elif platform == "darwin": # macOS
-        if app_name == "notepad":
-            subprocess.Popen(["open", "-a", "TextEdit"])
-        elif app_name == "document":
-            subprocess.Popen(["open", "-a", "Microsoft Word"]) # or "Pages"
-        elif app_name == "excel":
-            subprocess.Popen(["open", "-a", "Microsoft Excel"]) # or "Numbers"
-        else:
-            speak(f"Sorry, I don't know how to open {app_name} on macOS.")
-
-    elif platform.startswith("linux"): # Linux
-        if app_name == "notepad":
-            subprocess.Popen(["gedit"]) # or "kate", "mousepad" etc.
-        elif app_name == "document":
-            subprocess.Popen(["libreoffice", "--writer"])
-        elif app_name == "excel":
-            subprocess.Popen(["libreoffice", "--calc"])
-        else:
-            speak(f"Sorry, I don't know how to open {app_name} on Linux.")
-            
+    turn = tracer.turn_for_caller()
+    future = app_manager.launch(app_name)
+    future.add_done_callback(lambda f: report_launch(launch_result(f, app_name), turn))
+
+
+def launch_result(future, app_name):
+    # An exception inside the launcher would otherwise only be logged by the executor.
+    error = future.exception()
+    if error is not None:
+        return LaunchResult(app_name, "failed", 0.0, str(error))
+    return future.result()
+
+
+def report_launch(result, turn):
+    # Runs on the launcher thread once the outcome is known, so nothing is promised up front.
+    if turn is not None:
+        turn.add("app_launch", result.latency_ms)
+    if result.status == "launched":
+        speak(f"Opening {result.app}...", turn=turn)
+    elif result.status == "focused":
+        speak(f"Switched to {result.app}.", turn=turn)
+    elif result.status == "running":
+        speak(f"{result.app} is already open.", turn=turn)
+    elif result.status == "missing":
+        speak(f"Sorry, I couldn't find {result.app} on this computer.", turn=turn)
     else:
-        speak(f"Unsupported operating system: {platform}")
+        print(result.error)
+        speak(f"Sorry, I couldn't open {result.app}.", turn=turn)
 
 
 
 
-def run_assistant():
+router = CommandRouter()
 
-    speak("Hello! I am your voice assistant. How can I help you today?")
 
-    while True:
-        command = listen_for_command()
-        
-        if command is None:
-            continue
+@router.command("time", **COMMANDS["time"])
+def handle_time(slots):
+    tell_time()
 
-      
-        if 'time' in command:
-            tell_time()
-            
-        elif 'weather' in command:
-      
-            try:
-                city = command.split("in")[-1].strip()
-                if city:
-                    get_weather(city)
-                else:
-                    get_weather() 
-            except Exception:
-                get_weather()
 
-        elif 'news' in command or 'headlines' in command:
-          get_news()
+@router.command("weather", **COMMANDS["weather"])
+def handle_weather(slots):
+    city = slots.get("city")
+    if city:
+        get_weather(city.title())
+    else:
+        get_weather()
 
-        elif 'open notepad' in command:
-            open_application("notepad")
-            
-        elif 'open document' in command or 'create a document' in command:
-            open_application("document")
 
-        elif 'open excel' in command or 'open spreadsheet' in command:
-            open_application("excel")
+@router.command("news", **COMMANDS["news"])
+def handle_news(slots):
+    get_news()
 
-        elif 'stop' in command or 'exit' in command or 'quit' in command:
-            speak("Goodbye! Have a great day.")
-            break
-        
- 
-        elif 'set speed to' in command  :           
-            try:
-                speed = command.split("to")[-1].strip()
-                set_speech_rate(speed)
-            except Exception as e:
-                speak("Please specify a number to set the speed.")
 
-        elif 'remind' in command: 
-            if 'remind me to' in command: 
-                reminder_text = command.split('remind me to', 1)[1].strip()
-                if reminder_text:
-                    set_reminder(reminder_text)
-                else:
-                    speak("Certainly. What should I remind you about?")
-                    reminder_command = listen_for_command()
-                    if reminder_command:
-                        set_reminder(reminder_command)
-            else:
-                speak("Certainly. What should I remind you about?")
-                reminder_command = listen_for_command()
-                if reminder_command:
-                    set_reminder(reminder_command)
-                else:
-                    speak("I didn't hear a response. Cancelling reminder.")
+@router.command("open_app", **COMMANDS["open_app"])
+def handle_open_app(slots):
+    app = slots.get("app")
+    if app in APP_ALIASES:
+        open_application(APP_ALIASES[app])
+    elif app:
+        speak(f"Sorry, I don't know how to open {app} yet.")
+    else:
+        speak("Which application should I open?")
+
+
+@router.command("stop", **COMMANDS["stop"])
+def handle_stop(slots):
+    speak("Goodbye! Have a great day.", block=True)
+    return True
+
+
+@router.command("speed", **COMMANDS["speed"])
+def handle_speed(slots):
+    if "speed" in slots:
+        set_speech_rate(slots["speed"])
+    else:
+        speak("Please specify a number to set the speed.")
+
+
+@router.command("remind", **COMMANDS["remind"])
+def handle_remind(slots):
+    reminder_text = slots.get("text")
+    if reminder_text:
+        set_reminder(reminder_text)
+        return
+    speak("Certainly. What should I remind you about?", block=True)
+    reminder_command = listen_for_command(flush=True)
+    if reminder_command:
+        set_reminder(reminder_command)
+    else:
+        speak("I didn't hear a response. Cancelling reminder.")
+
+
+@router.command("reminders", **COMMANDS["reminders"])
+def handle_reminders(slots):
+    pending = reminder_scheduler.pending()
+    if not pending:
+        speak("You don't have any reminders.")
+        return
+    if "action" not in slots:
+        list_reminders(pending)
+        return
+    if "all" in slots:
+        for _, rid, _, _ in pending:
+            reminder_scheduler.cancel(rid)
+        speak(f"Okay, I cancelled all {len(pending)} reminders.")
+        return
+
+    wanted = slots.get("text")
+    if not wanted:
+        list_reminders(pending)
+        speak("Which one should I cancel?", block=True)
+        wanted = listen_for_command(flush=True)
+        if not wanted:
+            speak("I didn't hear a response. Keeping your reminders.")
+            return
+    reminder = find_reminder(pending, wanted)
+    if reminder is None:
+        speak(f"Sorry, I couldn't find a reminder about '{wanted}'.")
+        return
+    reminder_scheduler.cancel(reminder[1])
+    speak(f"Okay, I cancelled the reminder to '{reminder[2]}'.")
+
+
+def describe_interval(seconds):
+    for unit, size in sorted(RECURRENCE_UNITS.items(), key=lambda item: -item[1]):
+        if seconds % size == 0:
+            count = seconds // size
+            return f"every {unit}" if count == 1 else f"every {count} {unit}s"
+    return f"every {seconds} seconds"
+
+
+def list_reminders(pending):
+    parts = []
+    for number, (due_ts, _, text, interval) in enumerate(pending, 1):
+        when = datetime.datetime.fromtimestamp(due_ts).strftime("%A at %I:%M %p")
+        repeat = f", {describe_interval(interval)}" if interval else ""
+        parts.append(f"{number}: {text}{repeat}, next on {when}")
+    noun = "reminder" if len(parts) == 1 else "reminders"
+    speak(f"You have {len(parts)} {noun}. " + ". ".join(parts) + ".")
+
+
+def find_reminder(pending, wanted):
+    """Pick a pending reminder by its number in the list or by (roughly) its text."""
+    wanted = wanted.lower().strip()
+    number = re.search(r"\d+", wanted)
+    if number:
+        index = int(number.group()) - 1
+        return pending[index] if 0 <= index < len(pending) else None
+    for reminder in pending:
+        if wanted in reminder[2].lower() or reminder[2].lower() in wanted:
+            return reminder
+    texts = [reminder[2].lower() for reminder in pending]
+    close = difflib.get_close_matches(wanted, texts, n=1, cutoff=0.6)
+    return pending[texts.index(close[0])] if close else None
 
-        else:
-            speak("Sorry, I don't know how to do that yet.")
+
+@router.command("stats", **COMMANDS["stats"])
+def handle_stats(slots):
+    print(tracer.report())
+    launches, launch_p50, launch_max = app_manager.latency_summary()
+    if launches:
+        print(f"App launches: n={launches} p50={launch_p50:.1f}ms max={launch_max:.1f}ms")
+    count, p50, p95 = tracer.summary()
+    if count:
+        speak(f"Over the last {count} turns, the median response took {p50:.0f} milliseconds "
+              f"and the 95th percentile took {p95:.0f} milliseconds.")
+    else:
+        speak("I haven't timed any turns yet.")
+
+
+def unknown_command():
+    speak("Sorry, I don't know how to do that yet.")
+
+
+def run_assistant(prefetch=True):
+
+    reminder_scheduler.start()
+    app_manager.start()
+    if prefetch:
+        start_prefetch()
+    router.load_plugins(PLUGIN_DIR, sys.modules[__name__])
+    speech_queue.start()
+    speech_queue.warm(WARM_PHRASES)
+    speak("Hello! I am your voice assistant. How can I help you today?")
+
+    try:
+        while True:
+            command = listen_for_command()
+            
+            if command is None:
+                continue
+
+            # Handlers return True to end the session.
+            with tracer.span("dispatch"):
+                finished = router.dispatch(command, fallback=unknown_command)
+            if finished:
+                break
+    finally:
+        tracer.end_turn()
 
 def set_speech_rate(rate_value):
    
     try:
         rate_value = int(rate_value)
-        engine.setProperty('rate', rate_value)
+        speech_queue.set_rate(rate_value)
         speak(f"My speech rate has been set to {rate_value}.")
     except ValueError:
         speak("Sorry, please specify a valid number for the speed.")
 
+RECURRENCE_UNITS = {"minute": 60, "hour": 3600, "day": 86400, "week": 604800}
+RECURRENCE_WORDS = {"hourly": "hour", "daily": "day", "weekly": "week"}
+RECURRENCE_PAT = re.compile(r"\bevery\s+(?:(\d+)\s+)?(minute|hour|day|week)s?\b|\b(hourly|daily|weekly)\b")
+
+
+def parse_recurrence(time_command):
+    """Split 'every day at 9 am' into (86400, 'at 9 am'); non-recurring gives (None, text)."""
+    m = RECURRENCE_PAT.search(time_command)
+    if not m:
+        return None, time_command
+    unit = m.group(2) or RECURRENCE_WORDS[m.group(3)]
+    interval = int(m.group(1) or 1) * RECURRENCE_UNITS[unit]
+    remainder = (time_command[:m.start()] + time_command[m.end():]).strip()
+    return interval, remainder
+
+
 def set_reminder(reminder_text):
-    speak(f"Okay, you want me to remind you to '{reminder_text}'. When should I remind you?")
+    speak(f"Okay, you want me to remind you to '{reminder_text}'. When should I remind you?", block=True)
 
 
-    time_command = listen_for_command()
+    time_command = listen_for_command(flush=True)
     if time_command is None:
         speak("I didn't hear a time. Cancelling reminder.")
         return
         
+    interval, time_command = parse_recurrence(time_command)
     cal = pdt.Calendar()
     now = datetime.datetime.now()
     
-    time_struct, parse_status = cal.parse(time_command, now)
+    if interval and not time_command:
+        time_struct, parse_status = (now + datetime.timedelta(seconds=interval)).timetuple(), 1
+    else:
+        time_struct, parse_status = cal.parse(time_command, now)
     
     if parse_status != 0:
     
         reminder_time = datetime.datetime(*time_struct[:6])
-        
+        if interval:
+            while reminder_time <= now:
+                reminder_time += datetime.timedelta(seconds=interval)
+        elif reminder_time <= now:
+            speak("That time has already passed. Please try again.")
+            return
+
+        reminder_scheduler.add(reminder_text, reminder_time, interval)
        
         formatted_time = reminder_time.strftime("%A, %B %d at %I:%M %p")
-        speak(f"Okay, reminder set to '{reminder_text}' for {formatted_time}.")
+        if interval:
+            speak(f"Okay, recurring reminder set to '{reminder_text}', starting {formatted_time}. "
+                  "Say 'cancel my reminder' to stop it.")
+        else:
+            speak(f"Okay, reminder set to '{reminder_text}' for {formatted_time}.")
         
     else:
         speak("Sorry, I couldn't understand the time. Please try again.")
 
+def run_batch(path, backend="transcript", mute=True):
+    """Run the normal dispatch loop over recordings instead of the microphone and report latency.
+
+    The run is isolated from the user's setup: reminders go to a throwaway
+    database, turns are traced apart from the live log and stats, apps are
+    not really launched, nothing is prefetched and, when muted, no TTS engine
+    is started.
+    """
+    global input_source, reminder_scheduler, app_manager, tracer
+    saved = input_source, reminder_scheduler, app_manager, tracer, speech_queue.muted
+    source = FileSource(load_batch(path), RECOGNIZER_BACKENDS[backend]())
+    scratch = tempfile.mkdtemp(prefix="assistant-batch-")
+    input_source = source
+    reminder_scheduler = ReminderScheduler(os.path.join(scratch, "reminders.sqlite3"), announce_reminder)
+    app_manager = ProcessManager(dry_run=True)
+    tracer = Tracer(None, budget_ms=TURN_BUDGET_MS)
+    speech_queue.muted = mute
+    try:
+        run_assistant(prefetch=False)
+    except InputExhausted:
+        pass
+    finally:
+        reminder_scheduler.stop()
+        input_source, reminder_scheduler, app_manager, tracer, speech_queue.muted = saved
+        shutil.rmtree(scratch, ignore_errors=True)
+    source.finish()
+    print_batch_report(source)
+    return source
+
+
 if __name__ == "__main__":
-    run_assistant()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Voice assistant")
+    parser.add_argument("--batch", help="WAV file, directory of WAVs or JSONL manifest to run instead of the microphone")
+    parser.add_argument("--backend", choices=sorted(RECOGNIZER_BACKENDS), help="speech recognizer backend")
+    parser.add_argument("--speak", action="store_true", help="speak responses aloud in batch mode")
+    args = parser.parse_args()
+
+    if args.batch:
+        run_batch(args.batch, args.backend or "transcript", mute=not args.speak)
+    else:
+        if args.backend:
+            input_source = BackgroundListener(RECOGNIZER_BACKENDS[args.backend](), echo_guard=speech_queue.is_echo)
+        run_assistant()
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""
+Table-driven command routing for the voice assistant.
+
+Commands register weighted keyword phrases and optional slot patterns.
+All phrases are compiled into one token trie, so routing is a single pass
+over the utterance however many commands are registered. Words missing
+from the trie get a fuzzy lookup to absorb recognition slips
+("whether" -> "weather"), though not other forms of a keyword
+("opened" is not "open"); commands registered with fuzzy=False only
+count exact words. Lead phrases ("remind me") claim the whole utterance
+for their command, so "remind me to stop at the bank" is a reminder and
+not a stop. Otherwise the best scoring command wins. Its slot patterns
+(named regex groups) are then matched against the utterance.
+
+Plugins are .py files with a register(router, assistant) function.
+"""
+import difflib
+import importlib.util
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+TOKEN_PAT = re.compile(r"[a-z0-9']+")
+# A word that is a keyword plus one of these is a different form of it
+# ("opened", "starts"), not a recognition slip, so it is never fuzzy matched.
+INFLECTIONS = ("s", "es", "d", "ed", "ing")
+
+
+@dataclass
+class Command:
+    name: str
+    keywords: Dict[str, float]
+    handler: Callable
+    slots: List[re.Pattern] = field(default_factory=list)
+    min_score: float = 1.0
+    fuzzy: bool = True
+    leads: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Match:
+    command: Command
+    score: float
+    slots: Dict[str, str]
+
+
+class CommandRouter:
+    def __init__(self, fuzzy_cutoff=0.8, short_fuzzy_cutoff=0.9):
+        self.fuzzy_cutoff = fuzzy_cutoff
+        # Short words collide easily (quite/quit, train/rain), so they need a
+        # near-exact match that also starts with the same letter.
+        self.short_fuzzy_cutoff = short_fuzzy_cutoff
+        self.commands: Dict[str, Command] = {}
+        self._order = {}
+        self._trie = None
+        self._fuzzy_cache = {}
+
+    def register(self, name, keywords, handler, slots=(), min_score=1.0, fuzzy=True, leads=()):
+        """Add (or replace) a command. keywords is {phrase: weight} or a list of phrases."""
+        if not isinstance(keywords, dict):
+            keywords = {phrase: 1.0 for phrase in keywords}
+        self.commands[name] = Command(
+            name, dict(keywords), handler, [re.compile(p) for p in slots], min_score, fuzzy, list(leads))
+        self._trie = None
+        return handler
+
+    def command(self, name, keywords, slots=(), min_score=1.0, fuzzy=True, leads=()):
+        def decorator(handler):
+            return self.register(name, keywords, handler, slots, min_score, fuzzy, leads)
+        return decorator
+
+    def load_plugins(self, directory, *args):
+        """Import every .py file in directory and call its register(self, *args)."""
+        if not os.path.isdir(directory):
+            return []
+        loaded = []
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(".py") or name.startswith("_"):
+                continue
+            path = os.path.join(directory, name)
+            spec = importlib.util.spec_from_file_location(f"assistant_plugin_{name[:-3]}", path)
+            module = importlib.util.module_from_spec(spec)
+            try:
+                spec.loader.exec_module(module)
+                if hasattr(module, "register"):
+                    module.register(self, *args)
+                    loaded.append(name[:-3])
+            except Exception as e:
+                print(f"Failed to load plugin {name}: {e}")
+        return loaded
+
+    def match(self, utterance) -> Optional[Match]:
+        if self._trie is None:
+            self._compile()
+        text = utterance.lower()
+        tokens = TOKEN_PAT.findall(text)
+        scores = {}
+        lead = None
+        for start in range(len(tokens)):
+            node = self._trie
+            similarity = 1.0
+            for token in tokens[start:]:
+                node, step = self._step(node, token)
+                if node is None:
+                    break
+                similarity *= step
+                for name, weight, is_lead in node.get(None, ()):
+                    if similarity < 1.0 and not self.commands[name].fuzzy:
+                        continue
+                    if is_lead:
+                        if similarity == 1.0 and lead is None:
+                            lead = name  # earliest lead phrase wins outright
+                    else:
+                        scores[name] = scores.get(name, 0.0) + weight * similarity
+
+        if lead is not None:
+            command, score = self.commands[lead], float("inf")
+        else:
+            best = None
+            for name, score in scores.items():
+                command = self.commands[name]
+                if score < command.min_score:
+                    continue
+                rank = (score, -self._order[name])  # registration order breaks ties
+                if best is None or rank > best[0]:
+                    best = (rank, command)
+            if best is None:
+                return None
+            (score, _), command = best
+
+        slots = {}
+        for pattern in command.slots:
+            m = pattern.search(text)
+            if m:
+                for key, value in m.groupdict().items():
+                    if value and key not in slots:
+                        slots[key] = value.strip()
+        return Match(command, score, slots)
+
+    def dispatch(self, utterance, fallback=None):
+        """Run the best matching handler with its slots; call fallback() if nothing matches."""
+        match = self.match(utterance)
+        if match is None:
+            return fallback() if fallback else None
+        return match.command.handler(match.slots)
+
+    def _compile(self):
+        trie = {}
+        self._order = {name: index for index, name in enumerate(self.commands)}
+        for command in self.commands.values():
+            entries = [(phrase, weight, False) for phrase, weight in command.keywords.items()]
+            entries += [(phrase, 0.0, True) for phrase in command.leads]
+            for phrase, weight, is_lead in entries:
+                node = trie
+                for token in TOKEN_PAT.findall(phrase.lower()):
+                    node = node.setdefault(token, {})
+                node.setdefault(None, []).append((command.name, weight, is_lead))
+        self._trie = trie
+        self._fuzzy_cache = {}
+
+    def _step(self, node, token):
+        child = node.get(token)
+        if child is not None:
+            return child, 1.0
+        if len(token) < 4:
+            return None, 0.0
+        cache_key = (id(node), token)
+        if cache_key not in self._fuzzy_cache:
+            if len(self._fuzzy_cache) > 4096:
+                self._fuzzy_cache.clear()
+            candidates = [key for key in node if key is not None
+                          and not (token.startswith(key) and token[len(key):] in INFLECTIONS)]
+            cutoff = self.fuzzy_cutoff
+            if len(token) < 6:
+                cutoff = self.short_fuzzy_cutoff
+                candidates = [key for key in candidates if key[0] == token[0]]
+            close = difflib.get_close_matches(token, candidates, n=1, cutoff=cutoff)
+            if close:
+                ratio = difflib.SequenceMatcher(None, token, close[0]).ratio()
+                self._fuzzy_cache[cache_key] = (close[0], ratio)
+            else:
+                self._fuzzy_cache[cache_key] = (None, 0.0)
+        key, ratio = self._fuzzy_cache[cache_key]
+        if key is None:
+            return None, 0.0
+        return node[key], ratio
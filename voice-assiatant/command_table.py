@@ -0,0 +1,84 @@
+"""
+Keywords, slot patterns and routing options for the assistant's built-in
+commands. The handlers live in assiatant.py. Keeping the table separate
+lets the routing be tested without a microphone or TTS engine.
+"""
+
+APP_ALIASES = {
+    "notepad": "notepad",
+    "document": "document",
+    "word": "document",
+    "excel": "excel",
+    "spreadsheet": "excel",
+}
+
+# Said after "weather in/for", these are times rather than cities.
+TIME_WORDS = r"(?:today|tomorrow|tonight|now|right now|this (?:morning|afternoon|evening|week|weekend))"
+
+# Keyword weights decide between commands that share words: in
+# "what time is the weather" the weather keyword outweighs the time ones.
+COMMANDS = {
+    "time": {
+        "keywords": {"time": 1, "what time": 1, "time is it": 2, "clock": 1},
+    },
+    "weather": {
+        "keywords": {"weather": 3, "forecast": 3, "temperature": 2, "rain": 2},
+        "slots": [
+            rf"\b(?:in|at|for)\s+(?!{TIME_WORDS}\b)(?P<city>[a-z][a-z .'-]*?)"
+            rf"(?:\s+(?:for\s+)?{TIME_WORDS})?\s*$"
+        ],
+    },
+    "news": {
+        "keywords": {"news": 3, "headlines": 3},
+    },
+    # A verb alone ("is the shop open today") is not enough: it needs an app
+    # name after it, or "launch", which is only ever said about apps.
+    "open_app": {
+        "keywords": {"open": 2, "start": 2, "launch": 3, "create a document": 3,
+                     **{alias: 1 for alias in APP_ALIASES}},
+        "min_score": 3,
+        # Known apps are found anywhere after the verb; otherwise the word after
+        # the verb (and any filler) is reported back as the unknown app.
+        "slots": [
+            rf"\b(?:open|launch|start|create)\b.*?\b(?P<app>{'|'.join(APP_ALIASES)})\b",
+            r"\b(?:open|launch|start)\s+(?:(?:a|an|the|my|new)\s+)*(?P<app>[a-z]+)",
+        ],
+    },
+    # Ending the session on a misheard word is worse than asking again,
+    # so exit words only count when heard exactly.
+    "stop": {
+        "keywords": {"stop": 3, "exit": 3, "quit": 3, "goodbye": 3},
+        "fuzzy": False,
+    },
+    "speed": {
+        "keywords": {"speed": 3, "set speed": 1, "speech rate": 3},
+        "slots": [r"(?P<speed>\d+)"],
+    },
+    "remind": {
+        "keywords": {"remind": 3, "reminder": 3},
+        "slots": [r"\bremind me (?:to|about)\s+(?P<text>.+)"],
+        "leads": ["remind me", "set a reminder"],
+    },
+    # Listing and cancelling reminders. The lead phrases keep "cancel my
+    # reminder" away from "remind" and "stop reminding me" away from "stop".
+    "reminders": {
+        "keywords": {"my reminders": 3, "list reminders": 3},
+        "slots": [
+            r"\b(?P<action>cancel|delete|remove|stop)\b",
+            r"\b(?P<all>all)\b",
+            r"\b(?:reminders?|reminding me)\s+(?:about|to|for)\s+(?P<text>.+)",
+        ],
+        "leads": [
+            "my reminders", "list reminders", "list my reminders",
+            "cancel reminder", "cancel a reminder", "cancel the reminder", "cancel my reminder",
+            "cancel reminders", "cancel my reminders", "cancel all reminders", "cancel all my reminders",
+            "delete reminder", "delete the reminder", "delete my reminder", "delete my reminders",
+            "delete all reminders", "remove the reminder", "remove my reminder",
+            "stop reminding me",
+        ],
+    },
+    "stats": {
+        "keywords": {"stats": 3, "statistics": 3, "latency": 3},
+        "fuzzy": False,  # "starts" is too close to "stats"
+    },
+}
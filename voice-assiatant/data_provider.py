@@ -0,0 +1,146 @@
+"""
+Shared HTTP layer for the voice assistant's weather and news lookups.
+
+One pooled requests.Session with timeouts, a per-key TTL cache,
+conditional requests (ETag / Last-Modified) and stale-while-revalidate,
+plus a background prefetcher that keeps frequently asked keys warm.
+"""
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TIMEOUT = (3.05, 8)  # (connect, read) seconds
+
+
+class CacheEntry:
+    def __init__(self, status, data, etag=None, last_modified=None):
+        self.status = status
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = time.monotonic()
+
+    def age(self):
+        return time.monotonic() - self.fetched_at
+
+
+class CachedFetcher:
+    def __init__(self, ttl=600, stale_ttl=1800, timeout=DEFAULT_TIMEOUT, pool_size=4):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._cache = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._prefetch_stop = threading.Event()
+
+    def get(self, key, url, params=None, ttl=None):
+        """Return (status_code, json) for url, cached under key.
+
+        Fresh entries are returned directly. Entries past their TTL but within
+        stale_ttl are returned immediately while a background refresh runs.
+        If the upstream fails or times out, the last good entry is used.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            entry = self._cache.get(key)
+        if entry is not None:
+            age = entry.age()
+            if age < ttl:
+                return entry.status, entry.data
+            if age < ttl + self.stale_ttl:
+                self._refresh_in_background(key, url, params, ttl)
+                return entry.status, entry.data
+
+        try:
+            entry = self.refresh(key, url, params, ttl)
+        except requests.exceptions.RequestException:
+            with self._lock:
+                entry = self._cache.get(key)
+            if entry is None:
+                raise
+        return entry.status, entry.data
+
+    def refresh(self, key, url, params=None, ttl=None):
+        """Fetch url now, sending conditional headers when a cached copy exists."""
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            cached = self._cache.get(key)
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and cached is not None:
+            entry = CacheEntry(cached.status, cached.data, cached.etag, cached.last_modified)
+        elif response.status_code >= 500 or response.status_code == 429:
+            # Treat server errors and rate limiting like a network failure so a
+            # stale copy can be served instead of caching the error.
+            response.raise_for_status()
+        else:
+            try:
+                data = response.json()
+            except ValueError:
+                data = {"message": response.text}
+            entry = CacheEntry(
+                response.status_code,
+                data,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+            )
+            if response.status_code != 200:
+                # Don't let an error (bad key, unknown city) outlive a short window.
+                entry.fetched_at -= max(0, ttl - 60)
+
+        with self._lock:
+            self._cache[key] = entry
+        return entry
+
+    def _refresh_in_background(self, key, url, params, ttl):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                self.refresh(key, url, params, ttl)
+            except requests.exceptions.RequestException as e:
+                print(f"Background refresh failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name="refresh", daemon=True).start()
+
+    def start_prefetch(self, jobs, ttl=None, interval=None):
+        """Keep each (key, url, params) job warm by refreshing it every interval seconds.
+
+        interval defaults to just under the TTL. Pass a longer one for APIs with a
+        tight daily quota; requests in between are then served from the stale window.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        interval = interval or max(30, ttl * 0.8)
+
+        def run():
+            while not self._prefetch_stop.is_set():
+                for key, url, params in jobs:
+                    try:
+                        self.refresh(key, url, params, ttl)
+                    except requests.exceptions.RequestException as e:
+                        print(f"Prefetch failed for {key}: {e}")
+                self._prefetch_stop.wait(interval)
+
+        threading.Thread(target=run, name="prefetch", daemon=True).start()
+
+    def stop_prefetch(self):
+        self._prefetch_stop.set()
@@ -0,0 +1,222 @@
+"""
+Application launching for the voice assistant.
+
+Executable paths are resolved once (PATH, the Windows "App Paths"
+registry, macOS app bundles) instead of going through a shell on every
+launch. Launches run on a small thread pool, every child gets a watcher
+thread that reaps it when it exits, and asking for an app that is still
+running brings its window to the front instead of starting another copy.
+
+On macOS apps are started through `open -a`, which exits straight away
+and already focuses a running instance, so a repeat request simply runs
+it again.
+"""
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+APP_CANDIDATES = {
+    "win32": {
+        "notepad": [["notepad.exe"]],
+        "document": [["winword.exe"]],
+        "excel": [["excel.exe"]],
+    },
+    "darwin": {
+        "notepad": [["open", "-a", "TextEdit"]],
+        "document": [["open", "-a", "Microsoft Word"], ["open", "-a", "Pages"]],
+        "excel": [["open", "-a", "Microsoft Excel"], ["open", "-a", "Numbers"]],
+    },
+    "linux": {
+        "notepad": [["gedit"], ["kate"], ["mousepad"], ["xed"]],
+        "document": [["libreoffice", "--writer"]],
+        "excel": [["libreoffice", "--calc"]],
+    },
+}
+
+
+def platform_key(platform=sys.platform):
+    return "linux" if platform.startswith("linux") else platform
+
+
+@dataclass
+class LaunchResult:
+    app: str
+    status: str  # launched, focused, running, missing or failed
+    latency_ms: float
+    error: Optional[str] = None
+
+
+def _windows_app_path(exe):
+    # "start winword" finds Office through the App Paths registry key, not PATH.
+    try:
+        import winreg
+    except ImportError:
+        return None
+    key_path = "SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\App Paths\\" + exe
+    for root in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+        try:
+            with winreg.OpenKey(root, key_path) as key:
+                path = winreg.QueryValue(key, None).strip('"')
+        except OSError:
+            continue
+        if path and os.path.exists(path):
+            return path
+    return None
+
+
+def _mac_app_bundle(name):
+    for base in ("/Applications", "/System/Applications", os.path.expanduser("~/Applications")):
+        path = os.path.join(base, name + ".app")
+        if os.path.isdir(path):
+            return path
+    return None
+
+
+def resolve_command(argv, platform=sys.platform):
+    """Return argv with its program resolved to an absolute path, or None if it isn't installed."""
+    if platform == "darwin" and argv[:2] == ["open", "-a"]:
+        bundle = _mac_app_bundle(argv[2])
+        return ["open", "-a", bundle] + argv[3:] if bundle else None
+    path = shutil.which(argv[0])
+    if path is None and platform == "win32":
+        path = _windows_app_path(argv[0])
+    return [path] + argv[1:] if path else None
+
+
+def _focus_windows(pid):
+    import ctypes
+    from ctypes import wintypes
+
+    user32 = ctypes.windll.user32
+    found = []
+
+    @ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+    def callback(hwnd, lparam):
+        owner = wintypes.DWORD()
+        user32.GetWindowThreadProcessId(hwnd, ctypes.byref(owner))
+        if owner.value == pid and user32.IsWindowVisible(hwnd):
+            found.append(hwnd)
+            return False
+        return True
+
+    user32.EnumWindows(callback, 0)
+    if not found:
+        return False
+    user32.ShowWindow(found[0], 9)  # SW_RESTORE
+    return bool(user32.SetForegroundWindow(found[0]))
+
+
+def _focus_linux(pid):
+    if not shutil.which("wmctrl"):
+        return False
+    listing = subprocess.run(["wmctrl", "-lp"], capture_output=True, text=True, timeout=2).stdout
+    for line in listing.splitlines():
+        parts = line.split(None, 4)
+        if len(parts) >= 3 and parts[2] == str(pid):
+            return subprocess.run(["wmctrl", "-ia", parts[0]], timeout=2).returncode == 0
+    return False
+
+
+def focus_process(pid, platform=sys.platform):
+    try:
+        if platform == "win32":
+            return _focus_windows(pid)
+        if platform.startswith("linux"):
+            return _focus_linux(pid)
+    except Exception as e:
+        print(f"Could not focus process {pid}: {e}")
+    return False
+
+
+class ProcessManager:
+    def __init__(self, candidates=None, platform=sys.platform, max_workers=2, dry_run=False):
+        # dry_run reports apps as launched without starting anything (batch runs).
+        self.dry_run = dry_run
+        self.platform = platform
+        self.candidates = candidates if candidates is not None else APP_CANDIDATES.get(platform_key(platform), {})
+        self.commands = {}
+        self.latencies = deque(maxlen=100)
+        self._procs = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="launch")
+        self._resolved = None
+
+    def start(self):
+        """Resolve every known app's executable in the background."""
+        with self._lock:
+            if self._resolved is None:
+                self._resolved = self._executor.submit(self._resolve_all)
+        return self._resolved
+
+    def known(self, app):
+        return app in self.candidates
+
+    def is_running(self, app):
+        with self._lock:
+            proc = self._procs.get(app)
+        return proc is not None and proc.poll() is None
+
+    def launch(self, app):
+        """Start (or focus) app without blocking; returns a Future of LaunchResult."""
+        self.start()
+        return self._executor.submit(self._launch, app, time.perf_counter())
+
+    def latency_summary(self):
+        values = sorted(self.latencies)
+        if not values:
+            return 0, 0.0, 0.0
+        return len(values), values[len(values) // 2], values[-1]
+
+    def _resolve_all(self):
+        if self.dry_run:
+            return
+        for app, specs in self.candidates.items():
+            self.commands[app] = next(
+                (cmd for cmd in (resolve_command(spec, self.platform) for spec in specs) if cmd), None)
+
+    def _launch(self, app, requested_at):
+        if self.dry_run:
+            return self._result(app, "launched", requested_at)
+        self._resolved.result()
+        with self._lock:
+            proc = self._procs.get(app)
+        if proc is not None and proc.poll() is None:
+            status = "focused" if focus_process(proc.pid, self.platform) else "running"
+            return self._result(app, status, requested_at)
+
+        command = self.commands.get(app)
+        if command is None:
+            return self._result(app, "missing", requested_at)
+
+        kwargs = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+        if self.platform != "win32":
+            kwargs["start_new_session"] = True  # don't pass the assistant's Ctrl+C on to the app
+        try:
+            proc = subprocess.Popen(command, **kwargs)
+        except OSError as e:
+            return self._result(app, "failed", requested_at, str(e))
+
+        with self._lock:
+            self._procs[app] = proc
+        threading.Thread(target=self._reap, args=(app, proc), name=f"reap-{app}", daemon=True).start()
+        return self._result(app, "launched", requested_at)
+
+    def _reap(self, app, proc):
+        proc.wait()
+        with self._lock:
+            if self._procs.get(app) is proc:
+                del self._procs[app]
+
+    def _result(self, app, status, requested_at, error=None):
+        latency_ms = (time.perf_counter() - requested_at) * 1000
+        if status == "launched":
+            # Focus attempts and failures would skew the launch latency figures.
+            self.latencies.append(latency_ms)
+        return LaunchResult(app, status, latency_ms, error)
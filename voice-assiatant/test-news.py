@@ -1,6 +1,7 @@
 import os
 import requests
 from dotenv import load_dotenv
+from data_provider import CachedFetcher
 
 load_dotenv()
 
@@ -12,16 +13,16 @@ if not NEWS_API_KEY:
     print("\nERROR: Could not load NEWS_API_KEY from .env file. Please check the file.")
 else:
 
-    base_url = f"https://newsapi.org/v2/top-headlines?country=us&apiKey={NEWS_API_KEY}"
+    base_url = "https://newsapi.org/v2/top-headlines"
+    fetcher = CachedFetcher()
     
     try:
         print(f"Attempting to connect to: {base_url}")
-        response = requests.get(base_url)
-        print(f"Status Code: {response.status_code}")
+        status, data = fetcher.get(("news", "us"), base_url, {"country": "us", "apiKey": NEWS_API_KEY})
+        print(f"Status Code: {status}")
 
 
-        if response.status_code == 200:
-            data = response.json()
+        if status == 200:
             
 
             if data.get('status') == 'ok':
@@ -42,8 +43,8 @@ else:
         
         else:
 
-            print(f"\nHTTP Error: Failed to retrieve data. Status code: {response.status_code}")
-            print(f"Response: {response.text}")
+            print(f"\nHTTP Error: Failed to retrieve data. Status code: {status}")
+            print(f"Response: {data}")
 
 
     except requests.exceptions.RequestException as e:
@@ -0,0 +1,115 @@
+import pytest
+
+from command_router import CommandRouter
+from command_table import COMMANDS
+
+
+@pytest.fixture
+def router():
+    router = CommandRouter()
+    for name, spec in COMMANDS.items():
+        router.register(name, handler=lambda slots, name=name: (name, slots), **spec)
+    return router
+
+
+def route(router, utterance):
+    match = router.match(utterance)
+    return match.command.name if match else None
+
+
+@pytest.mark.parametrize("utterance, expected", [
+    ("what time is it", "time"),
+    ("what time is the weather", "weather"),
+    ("whether in new delhi today", "weather"),
+    ("what's the temprature in mumbai", "weather"),
+    ("read the headlines", "news"),
+    ("open excel", "open_app"),
+    ("create a document", "open_app"),
+    ("set speed to 150", "speed"),
+    ("please quit", "stop"),
+    ("stats", "stats"),
+])
+def test_routes_commands(router, utterance, expected):
+    assert route(router, utterance) == expected
+
+
+@pytest.mark.parametrize("utterance", [
+    "that's quite good",
+    "does that file exist",
+    "when is my train",
+    "hello there",
+    "the movie starts at nine",
+    "i opened the window",
+    "when does the show start",
+    "is the shop open today",
+])
+def test_ordinary_speech_does_not_route(router, utterance):
+    assert route(router, utterance) is None
+
+
+def test_fuzzy_words_never_stop_the_session(router):
+    assert route(router, "I'm quite sure, open excel") == "open_app"
+
+
+@pytest.mark.parametrize("utterance, text", [
+    ("remind me to stop at the bank", "stop at the bank"),
+    ("remind me to check the weather", "check the weather"),
+    ("remind me to read the news", "read the news"),
+    ("can you remind me about the meeting", "the meeting"),
+])
+def test_remind_me_claims_the_utterance(router, utterance, text):
+    assert router.dispatch(utterance) == ("remind", {"text": text})
+
+
+@pytest.mark.parametrize("utterance, slots", [
+    ("what are my reminders", {}),
+    ("list reminders", {}),
+    ("cancel my reminder about the bank", {"action": "cancel", "text": "the bank"}),
+    ("stop reminding me to stretch", {"action": "stop", "text": "stretch"}),
+    ("delete all reminders", {"action": "delete", "all": "all"}),
+    ("cancel the reminder", {"action": "cancel"}),
+])
+def test_reminders_can_be_listed_and_cancelled(router, utterance, slots):
+    assert router.dispatch(utterance) == ("reminders", slots)
+
+
+def test_remind_me_to_cancel_is_still_a_reminder(router):
+    assert router.dispatch("remind me to cancel the gym") == ("remind", {"text": "cancel the gym"})
+
+
+@pytest.mark.parametrize("utterance, city", [
+    ("what is the weather in berlin", "berlin"),
+    ("weather in mumbai today", "mumbai"),
+    ("how is the weather in bengaluru", "bengaluru"),
+    ("weather in paris for tomorrow", "paris"),
+    ("what's the weather in new york this weekend", "new york"),
+])
+def test_weather_city_slot(router, utterance, city):
+    assert router.dispatch(utterance) == ("weather", {"city": city})
+
+
+@pytest.mark.parametrize("utterance", ["weather for tomorrow", "what's the weather today", "weather right now"])
+def test_weather_time_words_are_not_cities(router, utterance):
+    assert router.dispatch(utterance) == ("weather", {})
+
+
+@pytest.mark.parametrize("utterance, app", [
+    ("open excel", "excel"),
+    ("open a new document", "document"),
+    ("please open my spreadsheet", "spreadsheet"),
+    ("create a document", "document"),
+    ("launch chrome", "chrome"),
+    ("launch the new browser", "browser"),
+    ("start notepad", "notepad"),
+])
+def test_app_slot(router, utterance, app):
+    assert router.dispatch(utterance) == ("open_app", {"app": app})
+
+
+def test_speed_slot(router):
+    assert router.dispatch("set speed to 150") == ("speed", {"speed": "150"})
+
+
+def test_plugin_registration_replaces_trie(router):
+    router.register("joke", {"joke": 3}, lambda slots: "knock knock")
+    assert router.dispatch("tell me a joke") == "knock knock"
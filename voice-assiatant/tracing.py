@@ -0,0 +1,166 @@
+"""
+Per-turn latency tracing for the voice assistant.
+
+A turn starts when a recognised phrase reaches the main loop and carries
+the capture / recognition timings measured on the listener threads.
+Spans recorded while it is current (dispatch, weather / news fetches,
+time until the reply starts playing) are added to it. A follow-up
+answer heard inside dispatch (e.g. "when should I remind you?") is
+folded into the open turn, and the time spent waiting for it is left
+out of the surrounding spans.
+
+The turn's total is measured from the end of the captured phrase to
+the first audio of the reply (or the end of dispatch if nothing was
+said). Capture itself includes the user talking, so it is reported but
+kept out of the total and the budget. When the next turn begins, the
+finished turn is appended to a JSONL log and folded into rolling windows
+for p50/p95 reporting. It is also flagged if it went over the latency
+budget.
+"""
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Turn:
+    _ids = itertools.count(1)
+
+    def __init__(self, command, spans=None, heard_at=None):
+        self.id = next(self._ids)
+        self.command = command
+        self.started = time.perf_counter()
+        self.heard_at = heard_at if heard_at is not None else self.started
+        self.wall_time = time.time()
+        self.thread = threading.get_ident()
+        self.spans = dict(spans or {})
+        self.first_audio = None
+        self.ended = None
+        self.paused_ms = 0.0
+        self.paused_before_reply_ms = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, name, ms):
+        with self._lock:
+            self.spans[name] = self.spans.get(name, 0.0) + ms
+
+
+class Tracer:
+    def __init__(self, path=None, budget_ms=2500, window=200):
+        self.path = path
+        self.budget_ms = budget_ms
+        self.current = None
+        self._open_spans = 0
+        self._windows = {}
+        self._window = window
+        self._lock = threading.Lock()
+
+    def begin_turn(self, command, spans=None, heard_at=None, waited_ms=0.0):
+        """Start a turn for a phrase heard at heard_at (perf_counter).
+
+        Called while a span of the current turn is open, the phrase is a follow-up
+        answer: its spans join the current turn and waited_ms (time spent waiting
+        for the user) is excluded from the open spans.
+        """
+        if self.current is not None and self._open_spans > 0:
+            self.current.paused_ms += waited_ms
+            if self.current.first_audio is None:
+                self.current.paused_before_reply_ms += waited_ms
+            for name, ms in (spans or {}).items():
+                self.current.add("followup_" + name, ms)
+            return self.current
+        self.end_turn()
+        self.current = Turn(command, spans, heard_at)
+        return self.current
+
+    def end_turn(self):
+        turn, self.current = self.current, None
+        if turn is not None:
+            self._finish(turn)
+
+    def turn_for_caller(self):
+        """The current turn if it belongs to the calling thread, else None."""
+        turn = self.current
+        if turn is not None and turn.thread == threading.get_ident():
+            return turn
+        return None
+
+    @contextmanager
+    def span(self, name):
+        turn = self.current
+        t0 = time.perf_counter()
+        paused0 = turn.paused_ms if turn is not None else 0.0
+        self._open_spans += 1
+        try:
+            yield
+        finally:
+            self._open_spans -= 1
+            if turn is not None:
+                now = time.perf_counter()
+                turn.add(name, (now - t0) * 1000 - (turn.paused_ms - paused0))
+                turn.ended = now
+
+    def first_audio(self, turn, enqueued_at):
+        """Called by the TTS worker when an utterance queued during turn starts playing."""
+        now = time.perf_counter()
+        if turn is None or turn.first_audio is not None:
+            return
+        turn.first_audio = now
+        turn.add("tts_wait", (now - enqueued_at) * 1000)
+
+    def _finish(self, turn):
+        spans = dict(turn.spans)
+        replied_at = turn.first_audio or turn.ended or time.perf_counter()
+        spans["response"] = max(0.0, (replied_at - turn.started) * 1000 - turn.paused_before_reply_ms)
+        total = max(0.0, (replied_at - turn.heard_at) * 1000 - turn.paused_before_reply_ms)
+        over_budget = total > self.budget_ms
+
+        with self._lock:
+            for name, ms in list(spans.items()) + [("total", total)]:
+                self._windows.setdefault(name, deque(maxlen=self._window)).append(ms)
+
+        record = {
+            "turn": turn.id,
+            "at": turn.wall_time,
+            "command": turn.command,
+            "total_ms": round(total, 1),
+            "over_budget": over_budget,
+            "spans": {name: round(ms, 1) for name, ms in spans.items()},
+        }
+        if self.path:
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+            except OSError as e:
+                print(f"Could not write trace: {e}")
+        if over_budget:
+            breakdown = ", ".join(f"{name}={ms:.0f}ms" for name, ms in spans.items())
+            print(f"Slow turn {turn.id} ({total:.0f}ms > {self.budget_ms}ms budget): {breakdown}")
+
+    def summary(self, name="total"):
+        """Return (count, p50, p95) for a span over the rolling window."""
+        with self._lock:
+            values = list(self._windows.get(name, ()))
+        return len(values), percentile(values, 50), percentile(values, 95)
+
+    def report(self):
+        with self._lock:
+            names = list(self._windows)
+        if not names:
+            return "No turns recorded yet."
+        lines = ["--- Turn Latency (rolling) ---"]
+        for name in sorted(names, key=lambda n: (n == "total", n)):
+            count, p50, p95 = self.summary(name)
+            lines.append(f"{name:<14} n={count:<4} p50={p50:8.1f}ms p95={p95:8.1f}ms")
+        lines.append("------------------------------")
+        return "\n".join(lines)